@@ -4,22 +4,181 @@ Handles loading, validation, and management of configuration files.
 """
 
 import os
-import yaml
+import re
+import copy
+import functools
+import threading
 import json
-from typing import Dict, Any, Optional, Tuple, Union
+from typing import Dict, Any, List, Mapping, Optional, Tuple, Union
 from pathlib import Path
 import logging
 
-try:
-    from dotenv import load_dotenv
-    has_dotenv = True
-except ImportError:
-    has_dotenv = False
-    def load_dotenv(path: Optional[str] = None) -> bool:
-        return False
-
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _yaml_codec() -> Tuple[Any, Any, Any]:
+    """Import yaml on first use, preferring the LibYAML loader/dumper"""
+    import yaml
+    try:
+        from yaml import CSafeLoader as loader, CSafeDumper as dumper
+    except ImportError:
+        from yaml import SafeLoader as loader, SafeDumper as dumper
+    return yaml, loader, dumper
+
+@functools.lru_cache(maxsize=None)
+def _get_orjson() -> Optional[Any]:
+    """Import orjson on first use; None if it is not installed"""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+def _dumps_pretty(obj: Any) -> str:
+    """Encode with indentation, preferring orjson and falling back to json"""
+    orjson = _get_orjson()
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2)
+
+def _get_load_dotenv() -> Optional[Any]:
+    """Import python-dotenv on first use; None if it is not installed"""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return None
+    return load_dotenv
+
+_MISSING = object()
+
+# Environment variables that override configuration values
+_ENV_MAPPINGS: Dict[str, Tuple[str, ...]] = {
+    'MQTT_HOST': ('mqtt', 'host'),
+    'MQTT_PORT': ('mqtt', 'port'),
+    'MQTT_USERNAME': ('mqtt', 'username'),
+    'MQTT_PASSWORD': ('mqtt', 'password'),
+    'MQTT_USE_TLS': ('mqtt', 'use_tls'),
+    'SENSOR_PIN': ('sensor_pin',),
+    'SENSOR_TYPE': ('sensor_type',),
+    'UPDATE_INTERVAL': ('update_interval',),
+    'CLIENT_ID': ('client_id',),
+    'DATABASE_PATH': ('database', 'path'),
+    'DASHBOARD_PORT': ('dashboard', 'port'),
+    'LOG_LEVEL': ('logging', 'level')
+}
+
+_BOOL_VALUES = frozenset({'true', 'false'})
+# Mirror what int()/float() accept, including '_' digit separators
+_DIGITS = r'\d(?:_?\d)*'
+_INT_RE = re.compile(rf'[-+]?{_DIGITS}')
+_FLOAT_RE = re.compile(
+    rf'[-+]?(?:(?:{_DIGITS}\.(?:{_DIGITS})?|\.{_DIGITS}|{_DIGITS})'
+    rf'(?:[eE][-+]?{_DIGITS})?|inf(?:inity)?|nan)',
+    re.IGNORECASE
+)
+
+@functools.lru_cache(maxsize=64)
+def _convert_env_value(value: str) -> Any:
+    """Convert string environment values to appropriate types"""
+    stripped = value.strip()
+    
+    # Boolean conversion
+    lowered = stripped.lower()
+    if lowered in _BOOL_VALUES:
+        return lowered == 'true'
+    
+    # Integer conversion
+    if _INT_RE.fullmatch(stripped):
+        return int(stripped)
+    
+    # Float conversion
+    if _FLOAT_RE.fullmatch(stripped):
+        return float(stripped)
+    
+    # Return as string
+    return value
+
+# Parsed YAML keyed by (resolved path, mtime_ns, ctime_ns, size); FIFO-evicted
+_YAML_CACHE: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+_YAML_CACHE_MAX = 32
+_YAML_CACHE_LOCK = threading.Lock()
+
+def _source_fingerprint(st: os.stat_result) -> List[int]:
+    """Identify a file version; ctime also catches mtime-preserving copies"""
+    return [st.st_mtime_ns, st.st_ctime_ns, st.st_size]
+
+def _read_yaml_cached(path: Path) -> Dict[str, Any]:
+    """Parse a YAML file, reusing the previous result if the file is unchanged"""
+    st = path.stat()
+    key = (str(path.resolve()), *_source_fingerprint(st))
+    
+    with _YAML_CACHE_LOCK:
+        cached = _YAML_CACHE.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+    
+    yaml, loader, _ = _yaml_codec()
+    parsed = yaml.load(path.read_bytes(), Loader=loader) or {}
+    
+    with _YAML_CACHE_LOCK:
+        # Drop stale entries for this path before storing the new one
+        for stale in [k for k in _YAML_CACHE if k[0] == key[0]]:
+            del _YAML_CACHE[stale]
+        while len(_YAML_CACHE) >= _YAML_CACHE_MAX:
+            del _YAML_CACHE[next(iter(_YAML_CACHE))]
+        _YAML_CACHE[key] = parsed
+    return copy.deepcopy(parsed)
+
+def _invalidate_yaml_cache(path: Path) -> None:
+    """Forget any cached parse of the given file"""
+    resolved = str(path.resolve())
+    with _YAML_CACHE_LOCK:
+        for stale in [k for k in _YAML_CACHE if k[0] == resolved]:
+            del _YAML_CACHE[stale]
+
+def _merge_defaults(config: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a new dict of config with missing keys filled from defaults at every level"""
+    merged: Dict[str, Any] = {}
+    for key, value in config.items():
+        default = defaults.get(key)
+        if isinstance(value, dict) and isinstance(default, dict):
+            value = _merge_defaults(value, default)
+        merged[key] = value
+    for key, default in defaults.items():
+        if key not in config:
+            merged[key] = copy.deepcopy(default)
+    return merged
+
+class _LayeredView(Mapping):
+    """Read-only live view over config dicts, layering nested sections too"""
+    
+    __slots__ = ('_maps',)
+    
+    def __init__(self, *maps: Dict[str, Any]):
+        self._maps = maps
+    
+    def __getitem__(self, key: str) -> Any:
+        for layer in self._maps:
+            if key in layer:
+                value = layer[key]
+                break
+        else:
+            raise KeyError(key)
+        
+        if isinstance(value, dict):
+            return _LayeredView(*(layer[key] for layer in self._maps
+                                  if isinstance(layer.get(key), dict)))
+        return value
+    
+    def __iter__(self):
+        return iter(dict.fromkeys(key for layer in self._maps for key in layer))
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
 class ConfigManager:
     """Manages configuration loading and validation"""
     
@@ -27,25 +186,33 @@ class ConfigManager:
         self.config_path = Path(config_path)
         self.env_path = Path(env_path) if env_path else None
         self._config: Dict[str, Any] = {}
+        # Fallback values consulted at read time, never merged into _config
+        self._defaults: Dict[str, Any] = {}
+        # Memoized dotted-key splits
+        self._split_cache: Dict[str, Tuple[str, ...]] = {}
+        # Config merged over defaults; rebuilt lazily after any change
+        self._merged: Optional[Dict[str, Any]] = None
         self._load_config()
     
     def _load_config(self) -> None:
         """Load configuration from YAML file and environment variables"""
         try:
             # Load environment variables
-            if has_dotenv and self.env_path and self.env_path.exists():
-                load_dotenv(str(self.env_path))
+            if self.env_path and self.env_path.exists():
+                load_dotenv = _get_load_dotenv()
+                if load_dotenv is not None:
+                    load_dotenv(str(self.env_path))
             
             # Load YAML configuration
             if self.config_path.exists():
-                with open(self.config_path, 'r') as f:
-                    self._config = yaml.safe_load(f) or {}
+                self._config = _read_yaml_cached(self.config_path)
             else:
                 logger.warning(f"Config file not found: {self.config_path}")
                 self._config = {}
             
             # Override with environment variables
             self._apply_env_overrides()
+            self._merged = None
             
         except Exception as e:
             logger.error(f"Failed to load configuration: {e}")
@@ -53,108 +220,92 @@ class ConfigManager:
     
     def _apply_env_overrides(self) -> None:
         """Apply environment variable overrides"""
-        env_mappings: Dict[str, Tuple[str, ...]] = {
-            'MQTT_HOST': ('mqtt', 'host'),
-            'MQTT_PORT': ('mqtt', 'port'),
-            'MQTT_USERNAME': ('mqtt', 'username'),
-            'MQTT_PASSWORD': ('mqtt', 'password'),
-            'MQTT_USE_TLS': ('mqtt', 'use_tls'),
-            'SENSOR_PIN': ('sensor_pin',),
-            'SENSOR_TYPE': ('sensor_type',),
-            'UPDATE_INTERVAL': ('update_interval',),
-            'CLIENT_ID': ('client_id',),
-            'DATABASE_PATH': ('database', 'path'),
-            'DASHBOARD_PORT': ('dashboard', 'port'),
-            'LOG_LEVEL': ('logging', 'level')
-        }
+        environ = os.environ
+        present = _ENV_MAPPINGS.keys() & environ.keys()
         
-        for env_key, config_path in env_mappings.items():
-            value = os.getenv(env_key)
-            if value is not None:
-                self._set_nested_value(config_path, self._convert_env_value(value))
+        for env_key, config_path in _ENV_MAPPINGS.items():
+            if env_key in present:
+                self._set_nested_value(config_path, self._convert_env_value(environ[env_key]))
     
     def _convert_env_value(self, value: str) -> Any:
         """Convert string environment values to appropriate types"""
-        # Boolean conversion
-        if value.lower() in ('true', 'false'):
-            return value.lower() == 'true'
-        
-        # Integer conversion
-        try:
-            return int(value)
-        except ValueError:
-            pass
-        
-        # Float conversion
-        try:
-            return float(value)
-        except ValueError:
-            pass
-        
-        # Return as string
-        return value
+        return _convert_env_value(value)
     
     def _set_nested_value(self, path: Tuple[str, ...], value: Any) -> None:
         """Set a nested configuration value"""
         current: Dict[str, Any] = self._config
         for key in path[:-1]:
-            if key not in current:
-                current[key] = {}
-            current = current[key]
+            current = current.setdefault(key, {})
         current[path[-1]] = value
+        self._merged = None
+    
+    def _split_key(self, key: str) -> Tuple[str, ...]:
+        """Split a dotted key, memoizing the resulting path"""
+        parts = self._split_cache.get(key)
+        if parts is None:
+            parts = self._split_cache.setdefault(key, tuple(key.split('.')))
+        return parts
+    
+    def _merged_config(self) -> Dict[str, Any]:
+        """Return the cached merge of config over defaults, building it if stale"""
+        merged = self._merged
+        if merged is None:
+            merged = self._merged = _merge_defaults(self._config, self._defaults)
+        return merged
     
     def get(self, key: str, default: Any = None) -> Any:
-        """Get a configuration value by dot notation"""
-        keys = key.split('.')
-        current: Any = self._config
+        """Get a configuration value by dot notation.
         
+        Sections are returned as new dicts merged over their defaults.
+        """
+        value: Any = self._merged
+        if value is None:
+            value = self._merged_config()
         try:
-            for k in keys:
-                current = current[k]
-            return current
+            for k in self._split_cache.get(key) or self._split_key(key):
+                value = value[k]
         except (KeyError, TypeError):
             return default
+        return dict(value) if isinstance(value, dict) else value
     
     def set(self, key: str, value: Any) -> None:
         """Set a configuration value by dot notation"""
-        keys = key.split('.')
-        current: Dict[str, Any] = self._config
-        
-        for k in keys[:-1]:
-            if k not in current:
-                current[k] = {}
-            current = current[k]
-        
-        current[keys[-1]] = value
+        self._set_nested_value(self._split_key(key), value)
     
     def get_section(self, section: str) -> Dict[str, Any]:
-        """Get an entire configuration section"""
+        """Get an entire configuration section merged over its defaults.
+        
+        Returns a new dict; use set() to change configuration values.
+        """
         return self.get(section, {})
     
     def validate_config(self, schema: Dict[str, Any]) -> bool:
         """Validate configuration against a schema"""
         try:
-            return self._validate_recursive(self._config, schema)
+            return self._validate_recursive(self.to_dict(), schema)
         except Exception as e:
             logger.error(f"Configuration validation failed: {e}")
             return False
     
-    def _validate_recursive(self, config: Dict[str, Any], schema: Dict[str, Any]) -> bool:
-        """Recursively validate configuration"""
-        for key, expected_type in schema.items():
-            if key not in config:
-                logger.error(f"Missing required configuration key: {key}")
-                return False
-            
-            if isinstance(expected_type, dict):
-                if not isinstance(config[key], dict):
-                    logger.error(f"Configuration key '{key}' should be a dict")
+    def _validate_recursive(self, config: Mapping[str, Any], schema: Dict[str, Any]) -> bool:
+        """Validate nested configuration using an explicit stack"""
+        stack = [(config, schema)]
+        while stack:
+            current, current_schema = stack.pop()
+            for key, expected_type in current_schema.items():
+                if key not in current:
+                    logger.error(f"Missing required configuration key: {key}")
                     return False
-                if not self._validate_recursive(config[key], expected_type):
+                
+                value = current[key]
+                if isinstance(expected_type, dict):
+                    if not isinstance(value, dict):
+                        logger.error(f"Configuration key '{key}' should be a dict")
+                        return False
+                    stack.append((value, expected_type))
+                elif not isinstance(value, expected_type):
+                    logger.error(f"Configuration key '{key}' should be {expected_type}")
                     return False
-            elif not isinstance(config[key], expected_type):
-                logger.error(f"Configuration key '{key}' should be {expected_type}")
-                return False
         
         return True
     
@@ -164,8 +315,11 @@ class ConfigManager:
         
         try:
             save_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(save_path, 'w') as f:
-                yaml.dump(self._config, f, default_flow_style=False, indent=2)
+            yaml, _, dumper = _yaml_codec()
+            text = yaml.dump(self.to_dict(), Dumper=dumper,
+                             default_flow_style=False, indent=2)
+            save_path.write_bytes(text.encode())
+            _invalidate_yaml_cache(save_path)
             logger.info(f"Configuration saved to {save_path}")
         except Exception as e:
             logger.error(f"Failed to save configuration: {e}")
@@ -176,13 +330,18 @@ class ConfigManager:
         self._load_config()
         logger.info("Configuration reloaded")
     
+    def view(self) -> Mapping[str, Any]:
+        """Return a read-only live view of configuration layered over defaults"""
+        return _LayeredView(self._config, self._defaults)
+    
     def to_dict(self) -> Dict[str, Any]:
-        """Return configuration as dictionary"""
-        return self._config.copy()
+        """Return configuration merged with defaults as a new dictionary"""
+        return {key: dict(value) if isinstance(value, dict) else value
+                for key, value in self._merged_config().items()}
     
     def to_json(self) -> str:
         """Return configuration as JSON string"""
-        return json.dumps(self._config, indent=2)
+        return _dumps_pretty(self.to_dict())
 
 class ClientConfigManager(ConfigManager):
     """Configuration manager for client applications"""
@@ -190,15 +349,9 @@ class ClientConfigManager(ConfigManager):
     def __init__(self, config_path: str = "config/client_config.yaml", 
                  env_path: str = "config/.env"):
         super().__init__(config_path, env_path)
-        self._apply_defaults()
-    
-    def _apply_defaults(self) -> None:
-        """Apply default values for client configuration"""
-        from shared.constants import DEFAULT_CLIENT_CONFIG
         
-        for key, value in DEFAULT_CLIENT_CONFIG.items():
-            if key not in self._config:
-                self._config[key] = value
+        from shared.constants import DEFAULT_CLIENT_CONFIG
+        self._defaults = DEFAULT_CLIENT_CONFIG
 
 class HostConfigManager(ConfigManager):
     """Configuration manager for host applications"""
@@ -206,12 +359,6 @@ class HostConfigManager(ConfigManager):
     def __init__(self, config_path: str = "config/host_config.yaml",
                  env_path: str = "config/.env"):
         super().__init__(config_path, env_path)
-        self._apply_defaults()
-    
-    def _apply_defaults(self) -> None:
-        """Apply default values for host configuration"""
-        from shared.constants import DEFAULT_HOST_CONFIG
         
-        for key, value in DEFAULT_HOST_CONFIG.items():
-            if key not in self._config:
-                self._config[key] = value
\ No newline at end of file
+        from shared.constants import DEFAULT_HOST_CONFIG
+        self._defaults = DEFAULT_HOST_CONFIG
\ No newline at end of file
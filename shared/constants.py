@@ -4,7 +4,9 @@ Common constants and enums used across client and host applications.
 """
 
 from enum import Enum
-from typing import Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Tuple
 
 class SensorType(Enum):
     """Supported sensor types"""
@@ -39,6 +41,14 @@ MQTT_TOPICS = {
     "discovery": "sensors/discovery"
 }
 
+@lru_cache(maxsize=64)
+def build_topics(client_id: str) -> Mapping[str, str]:
+    """Return MQTT_TOPICS with {client_id} filled in (cached, read-only)"""
+    return MappingProxyType({
+        name: topic.format(client_id=client_id)
+        for name, topic in MQTT_TOPICS.items()
+    })
+
 # Default configurations
 DEFAULT_CLIENT_CONFIG = {
     "client_id": "pi_client_001",
@@ -113,6 +123,13 @@ SENSOR_RANGES = {
     }
 }
 
+# Flattened (sensor type, metric) -> (min, max) table for hot-path validation
+SENSOR_RANGES_FLAT: Dict[Tuple[SensorType, str], Tuple[float, float]] = {
+    (sensor_type, metric): (bounds["min"], bounds["max"])
+    for sensor_type, metrics in SENSOR_RANGES.items()
+    for metric, bounds in metrics.items()
+}
+
 # Error codes
 ERROR_CODES = {
     "SENSOR_READ_FAILED": 1001,
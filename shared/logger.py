@@ -3,15 +3,53 @@ Enhanced logging utility for IoT sensor network.
 Provides structured logging with rotation, formatting, and multiple handlers.
 """
 
+import functools
 import logging
 import logging.handlers
 import os
 import sys
+import threading
+import time
 from pathlib import Path
 from typing import Optional, Dict, Any
-from datetime import datetime
 import json
 
+# Byte multipliers for size suffixes accepted in logging config
+_SIZE_MULT = {'KB': 1024, 'MB': 1024 * 1024, 'GB': 1024 * 1024 * 1024}
+
+# LogRecord attributes that are not user-supplied extra fields
+_RESERVED_ATTRS = frozenset({
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
+    'filename', 'module', 'exc_info', 'exc_text', 'stack_info',
+    'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
+    'thread', 'threadName', 'processName', 'process', 'taskName',
+    'getMessage', 'message', 'asctime'
+})
+
+_ISO_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+_stdlib_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+@functools.lru_cache(maxsize=None)
+def _get_orjson() -> Optional[Any]:
+    """Import orjson on first use; None if it is not installed"""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+def _json_encode(obj: Any) -> str:
+    """Encode compactly, preferring orjson and falling back to json"""
+    orjson = _get_orjson()
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # e.g. integers beyond 64 bits, which json still handles
+            pass
+    return _stdlib_encode(obj)
+
 class ColoredFormatter(logging.Formatter):
     """Colored console formatter for better readability"""
     
@@ -32,9 +70,27 @@ class ColoredFormatter(logging.Formatter):
 class JSONFormatter(logging.Formatter):
     """JSON formatter for structured logging"""
     
+    # (whole second, formatted prefix) of the last timestamp rendered
+    _ts_cache = (None, '')
+    
+    def _format_timestamp(self, created: float) -> str:
+        """Render like datetime.fromtimestamp(created).isoformat()"""
+        second = int(created)
+        micros = round((created - second) * 1e6)
+        if micros >= 1000000:
+            second += 1
+            micros -= 1000000
+        
+        cached_second, prefix = self._ts_cache
+        if cached_second != second:
+            prefix = time.strftime(_ISO_FORMAT, time.localtime(second))
+            self._ts_cache = (second, prefix)
+        return f"{prefix}.{micros:06d}" if micros else prefix
+    
     def format(self, record):
+        timestamp = self._format_timestamp(record.created)
         log_entry = {
-            'timestamp': datetime.fromtimestamp(record.created).isoformat(),
+            'timestamp': timestamp,
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
@@ -49,13 +105,10 @@ class JSONFormatter(logging.Formatter):
         
         # Add extra fields
         for key, value in record.__dict__.items():
-            if key not in ('name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 
-                          'filename', 'module', 'exc_info', 'exc_text', 'stack_info',
-                          'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
-                          'thread', 'threadName', 'processName', 'process', 'getMessage'):
+            if key not in _RESERVED_ATTRS:
                 log_entry[key] = value
         
-        return json.dumps(log_entry)
+        return _json_encode(log_entry)
 
 class IoTLogger:
     """Enhanced logger for IoT applications"""
@@ -108,34 +161,31 @@ class IoTLogger:
             json_handler.setFormatter(JSONFormatter())
             self.logger.addHandler(json_handler)
         
-        # Error file handler
-        error_file = log_dir / f"{self.name}_error.log"
-        error_handler = logging.handlers.RotatingFileHandler(
-            error_file, maxBytes=max_bytes, backupCount=backup_count
-        )
-        error_handler.setFormatter(logging.Formatter(file_format))
-        error_handler.setLevel(logging.ERROR)
-        self.logger.addHandler(error_handler)
+        # Errors already reach the main log file; only split them out on request
+        if self.config.get('separate_error_log', False):
+            error_file = log_dir / f"{self.name}_error.log"
+            error_handler = logging.handlers.RotatingFileHandler(
+                error_file, maxBytes=max_bytes, backupCount=backup_count
+            )
+            error_handler.setFormatter(logging.Formatter(file_format))
+            error_handler.setLevel(logging.ERROR)
+            self.logger.addHandler(error_handler)
     
     def _parse_size(self, size_str: str) -> int:
         """Parse size string (e.g., '10MB') to bytes"""
         size_str = size_str.upper()
-        if size_str.endswith('KB'):
-            return int(size_str[:-2]) * 1024
-        elif size_str.endswith('MB'):
-            return int(size_str[:-2]) * 1024 * 1024
-        elif size_str.endswith('GB'):
-            return int(size_str[:-2]) * 1024 * 1024 * 1024
-        else:
-            return int(size_str)
+        mult = _SIZE_MULT.get(size_str[-2:])
+        return int(size_str[:-2]) * mult if mult else int(size_str)
     
     def debug(self, message: str, **kwargs):
         """Log debug message"""
-        self.logger.debug(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, extra=kwargs)
     
     def info(self, message: str, **kwargs):
         """Log info message"""
-        self.logger.info(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(message, extra=kwargs)
     
     def warning(self, message: str, **kwargs):
         """Log warning message"""
@@ -156,6 +206,9 @@ class IoTLogger:
     def sensor_reading(self, sensor_id: str, temperature: float, 
                       humidity: Optional[float] = None, **kwargs):
         """Log sensor reading with structured data"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         data = {
             'sensor_id': sensor_id,
             'temperature': temperature,
@@ -165,11 +218,14 @@ class IoTLogger:
             data['humidity'] = humidity
         data.update(kwargs)
         
-        self.info(f"Sensor reading: T={temperature}°C" + 
-                 (f", H={humidity}%" if humidity else ""), **data)
+        self.logger.info(f"Sensor reading: T={temperature}°C" + 
+                         (f", H={humidity}%" if humidity else ""), extra=data)
     
     def mqtt_event(self, event_type: str, topic: str, **kwargs):
         """Log MQTT events"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         data = {
             'event_type': event_type,
             'topic': topic,
@@ -177,10 +233,13 @@ class IoTLogger:
         }
         data.update(kwargs)
         
-        self.info(f"MQTT {event_type}: {topic}", **data)
+        self.logger.info(f"MQTT {event_type}: {topic}", extra=data)
     
     def system_event(self, event_type: str, component: str, **kwargs):
         """Log system events"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         data = {
             'event_type': event_type,
             'component': component,
@@ -188,11 +247,20 @@ class IoTLogger:
         }
         data.update(kwargs)
         
-        self.info(f"System {event_type}: {component}", **data)
+        self.logger.info(f"System {event_type}: {component}", extra=data)
+
+_LOGGER_CACHE: Dict[str, IoTLogger] = {}
+_LOGGER_CACHE_LOCK = threading.Lock()
 
 def get_logger(name: str, config: Optional[Dict[str, Any]] = None) -> IoTLogger:
     """Get or create a logger instance"""
-    return IoTLogger(name, config)
+    with _LOGGER_CACHE_LOCK:
+        instance = _LOGGER_CACHE.get(name)
+        # Rebuild handlers only when a different config is requested
+        if instance is None or (config is not None and config != instance.config):
+            instance = IoTLogger(name, config)
+            _LOGGER_CACHE[name] = instance
+        return instance
 
 def setup_root_logger(config: Optional[Dict[str, Any]] = None):
     """Setup root logger configuration"""
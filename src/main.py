@@ -4,16 +4,16 @@ Coordinates MQTT broker, web dashboard, and data management
 """
 
 import sys
-import signal
-import argparse
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
-# Add shared directory to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+# Add project root to Python path so the shared package is importable
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from shared.logger import get_logger
-from shared.config_manager import ConfigManager
+from shared.config_manager import HostConfigManager
 
 # Import host-specific modules
 # These will be implemented as the host system grows
@@ -21,19 +21,22 @@ from shared.config_manager import ConfigManager
 # from dashboard_server import DashboardServer
 # from data_manager import DataManager
 
+@lru_cache(maxsize=4)
+def _get_host_config_manager(config_path: Optional[str] = None) -> HostConfigManager:
+    """Return a shared config manager so each config file is parsed once"""
+    if config_path:
+        return HostConfigManager(config_path)
+    return HostConfigManager()
+
 class IoTSensorHost:
     """Main host server class"""
     
     def __init__(self, config_path: Optional[str] = None):
         self.logger = get_logger('host_main')
-        self.config_manager = ConfigManager()
+        self.config_manager = _get_host_config_manager(config_path)
+        self.config = self.config_manager.to_dict()
         self.running = False
-        
-        # Load configuration
-        if config_path:
-            self.config = self.config_manager.load_config(config_path)
-        else:
-            self.config = self.config_manager.get_default_host_config()
+        self._stop_event = threading.Event()
         
         self.logger.info("IoT Sensor Host Server initialized")
         
@@ -46,6 +49,7 @@ class IoTSensorHost:
         """Start the host server"""
         self.logger.info("Starting IoT Sensor Host Server...")
         self.running = True
+        self._stop_event.clear()
         
         try:
             # Start MQTT broker
@@ -62,10 +66,8 @@ class IoTSensorHost:
             
             self.logger.info("Host server started successfully")
             
-            # Keep running
-            while self.running:
-                import time
-                time.sleep(1)
+            # Block until stop() is called
+            self._stop_event.wait()
                 
         except KeyboardInterrupt:
             self.logger.info("Received interrupt signal")
@@ -78,6 +80,7 @@ class IoTSensorHost:
         """Stop the host server"""
         self.logger.info("Stopping IoT Sensor Host Server...")
         self.running = False
+        self._stop_event.set()
         
         # Stop components in reverse order
         # if hasattr(self, 'dashboard'):
@@ -103,6 +106,9 @@ class IoTSensorHost:
 
 def main():
     """Main entry point"""
+    import argparse
+    import signal
+    
     parser = argparse.ArgumentParser(description='IoT Sensor Host Server')
     parser.add_argument('--config', '-c', help='Configuration file path')
     parser.add_argument('--debug', '-d', action='store_true', help='Enable debug mode')